@@ -8,39 +8,83 @@ import asyncio
 import subprocess
 import json
 import os
+import re
 import sys
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import argparse
 
-from memory import Memory, Issue, RemediationAttempt
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+from memory import (
+    Memory, Issue, RemediationAttempt,
+    ATTEMPTS_FILE, PATTERNS_FILE, LEGACY_MEMORY_FILE, MAX_ATTEMPTS
+)
 from planner import Planner
+from utils import deployment_of
+
+
+_SEP = "=" * 70
+
+# Waiting reasons that are part of a normal pod start, not failures, as
+# long as the pod is younger than TRANSIENT_GRACE_SECONDS; after that it is
+# stuck (volume mount, CNI, ...) and reported
+TRANSIENT_WAITING_REASONS = {"ContainerCreating", "PodInitializing"}
+TRANSIENT_GRACE_SECONDS = 300
+
+# Waiting reasons where the container never started, so it has no logs
+NOT_STARTED_REASONS = {"ImagePullBackOff", "ErrImagePull", "InvalidImageName"}
+
+# Pause after a pod change before observing, so a burst of watch
+# events (delete, recreate, start) is handled in one iteration
+WATCH_SETTLE_SECONDS = 5
 
 
 def reset_memory_if_requested(args):
     """Reset memory on each run if --fresh flag is set"""
-    memory_file = "agentic_memory.json"
+    memory_files = [ATTEMPTS_FILE, ATTEMPTS_FILE + ".1", PATTERNS_FILE, LEGACY_MEMORY_FILE]
+    existing = [path for path in memory_files if os.path.exists(path)]
     
-    if args.fresh and os.path.exists(memory_file):
-        print("\n" + "="*70)
+    if args.fresh and existing:
+        print("\n" + _SEP)
         print("MEMORY RESET")
-        print("="*70)
-        print(f"Removing old memory file: {memory_file}")
-        os.remove(memory_file)
+        print(_SEP)
+        for path in existing:
+            print(f"Removing old memory file: {path}")
+            os.remove(path)
         print("Starting with fresh memory")
-        print("="*70 + "\n")
-    elif os.path.exists(memory_file):
+        print(_SEP + "\n")
+    elif os.path.exists(ATTEMPTS_FILE):
         try:
-            with open(memory_file, 'r') as f:
-                data = json.load(f)
-                attempts = len(data.get("attempts", []))
-                patterns = len(data.get("patterns", {}))
-                print("\n" + "="*70)
-                print("EXISTING MEMORY LOADED")
-                print("="*70)
-                print(f"Total attempts: {attempts}")
-                print(f"Patterns learned: {patterns}")
-                print("="*70 + "\n")
+            attempts = 0
+            for path in (ATTEMPTS_FILE + ".1", ATTEMPTS_FILE):
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        attempts += sum(1 for line in f if line.strip())
+            attempts = min(attempts, MAX_ATTEMPTS)
+            patterns = 0
+            if os.path.exists(PATTERNS_FILE):
+                with open(PATTERNS_FILE, 'rb') as f:
+                    patterns = len(_json_loads(f.read()))
+            print("\n" + _SEP)
+            print("EXISTING MEMORY LOADED")
+            print(_SEP)
+            print(f"Total attempts: {attempts}")
+            print(f"Patterns learned: {patterns}")
+            print(_SEP + "\n")
         except:
             pass
 
@@ -49,74 +93,192 @@ class KubernetesTools:
     """Kubernetes command execution tools"""
     
     @staticmethod
-    def get_pods(namespace: str) -> List[Dict]:
-        """Get all pods in namespace"""
+    async def _run_kubectl(args: List[str], timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """Run a kubectl command without blocking the event loop"""
+        proc = await asyncio.create_subprocess_exec(
+            "kubectl", *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
         try:
-            result = subprocess.run(
-                ["kubectl", "get", "pods", "-n", namespace, "-o", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            data = json.loads(result.stdout)
-            return data.get("items", [])
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, stdout.decode(), stderr.decode()
+    
+    @staticmethod
+    async def _check_kubectl(args: List[str]) -> str:
+        """Run a kubectl command and return stdout, raising on failure"""
+        returncode, stdout, stderr = await KubernetesTools._run_kubectl(args)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, ["kubectl"] + args, stdout, stderr)
+        return stdout
+    
+    @staticmethod
+    def _slim_pod(pod: Dict) -> Dict:
+        """Keep only the pod fields the monitor and planner look at"""
+        status = pod.get("status", {})
+        return {
+            "metadata": {
+                "name": pod["metadata"]["name"],
+                "resourceVersion": pod["metadata"].get("resourceVersion", ""),
+                "creationTimestamp": pod["metadata"].get("creationTimestamp", "")
+            },
+            "spec": {
+                "containers": [
+                    {
+                        "name": container.get("name"),
+                        "image": container.get("image", ""),
+                        "env": container.get("env", []),
+                        "resources": container.get("resources", {})
+                    }
+                    for container in pod.get("spec", {}).get("containers", [])
+                ]
+            },
+            "status": {
+                "phase": status.get("phase", ""),
+                "containerStatuses": [
+                    {
+                        "name": cs.get("name"),
+                        "ready": cs.get("ready", False),
+                        "restartCount": cs.get("restartCount", 0),
+                        "state": cs.get("state", {}),
+                        "lastState": cs.get("lastState", {})
+                    }
+                    for cs in status.get("containerStatuses", [])
+                ]
+            }
+        }
+    
+    @staticmethod
+    def format_pod_description(pod: Dict) -> str:
+        """Render a slim pod in the layout of kubectl describe"""
+        lines = [
+            f"Name:         {pod['metadata']['name']}",
+            f"Status:       {pod['status']['phase']}",
+            "Containers:"
+        ]
+        statuses = {cs["name"]: cs for cs in pod["status"]["containerStatuses"]}
+        for container in pod["spec"]["containers"]:
+            container_status = statuses.get(container["name"], {})
+            lines.append(f"  {container['name']}:")
+            lines.append(f"    Image:          {container['image']}")
+            
+            for label, key in (("State", "state"), ("Last State", "lastState")):
+                for state_name, detail in (container_status.get(key) or {}).items():
+                    line = f"    {label + ':':<16}{state_name.capitalize()}"
+                    if detail.get("reason"):
+                        line += f" ({detail['reason']})"
+                    if "exitCode" in detail:
+                        line += f", exit code {detail['exitCode']}"
+                    lines.append(line)
+            lines.append(f"    Restart Count:  {container_status.get('restartCount', 0)}")
+            
+            for label in ("limits", "requests"):
+                values = container["resources"].get(label)
+                if values:
+                    rendered = ", ".join(f"{k}={v}" for k, v in values.items())
+                    lines.append(f"    {label.capitalize() + ':':<16}{rendered}")
+            
+            if container["env"]:
+                lines.append("    Environment:")
+                for env in container["env"]:
+                    value = env.get("value", "<set from reference>" if "valueFrom" in env else "")
+                    lines.append(f"      {env['name']}:  {value}")
+        return "\n".join(lines)
+    
+    @staticmethod
+    async def get_pods(namespace: str) -> AsyncIterator[Dict]:
+        """Yield pods in namespace, parsed while kubectl is still writing"""
+        proc = await asyncio.create_subprocess_exec(
+            "kubectl", "get", "pods", "-n", namespace, "-o", "json",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            if ijson is not None:
+                async for pod in ijson.items(proc.stdout, "items.item", use_float=True):
+                    yield KubernetesTools._slim_pod(pod)
+                await proc.stdout.read()
+            else:
+                data = _json_loads(await proc.stdout.read())
+                for pod in data.get("items", []):
+                    yield KubernetesTools._slim_pod(pod)
         except Exception as e:
-            print(f"ERROR: Failed to get pods - {e}")
-            return []
+            if not proc.stdout.at_eof():
+                proc.kill()
+                await proc.wait()
+            stderr = (await proc.stderr.read()).decode().strip()
+            print(f"ERROR: Failed to get pods - {stderr or e}")
+        finally:
+            # Only kill a kubectl cut off mid-stream (caller stopped early or
+            # was cancelled); one that reached EOF is exiting on its own, and
+            # killing it races asyncio's child watcher
+            if proc.returncode is None and not proc.stdout.at_eof():
+                proc.kill()
+            await proc.wait()
     
     @staticmethod
-    def get_pod_logs(pod_name: str, namespace: str, tail: int = 50) -> str:
+    async def get_pod_logs(pod_name: str, namespace: str, tail: int = 50) -> str:
         """Get pod logs"""
         try:
-            result = subprocess.run(
-                ["kubectl", "logs", pod_name, "-n", namespace, f"--tail={tail}"],
-                capture_output=True,
-                text=True,
+            _, stdout, _ = await KubernetesTools._run_kubectl(
+                ["logs", pod_name, "-n", namespace, f"--tail={tail}"],
                 timeout=10
             )
-            return result.stdout
+            return stdout
         except Exception as e:
             return f"Error getting logs: {e}"
     
     @staticmethod
-    def get_pod_description(pod_name: str, namespace: str) -> str:
+    async def get_pod_description(pod_name: str, namespace: str) -> str:
         """Get pod description"""
         try:
-            result = subprocess.run(
-                ["kubectl", "describe", "pod", pod_name, "-n", namespace],
-                capture_output=True,
-                text=True,
-                check=True
+            return await KubernetesTools._check_kubectl(
+                ["describe", "pod", pod_name, "-n", namespace]
             )
-            return result.stdout
         except Exception as e:
             return f"Error describing pod: {e}"
     
     @staticmethod
-    def get_pod_events(pod_name: str, namespace: str) -> str:
-        """Get events for a pod"""
+    async def get_events(namespace: str) -> List[Dict]:
+        """Get all events in namespace, oldest first"""
         try:
-            result = subprocess.run(
-                ["kubectl", "get", "events", "-n", namespace, 
-                 "--field-selector", f"involvedObject.name={pod_name}",
-                 "--sort-by=.lastTimestamp"],
-                capture_output=True,
-                text=True,
-                check=True
+            stdout = await KubernetesTools._check_kubectl(
+                ["get", "events", "-n", namespace, "-o", "json",
+                 "--sort-by=.lastTimestamp"]
             )
-            return result.stdout
+            data = _json_loads(stdout)
+            return data.get("items", [])
         except Exception as e:
-            return f"Error getting events: {e}"
+            print(f"ERROR: Failed to get events - {e}")
+            return []
     
     @staticmethod
-    def restart_pod(pod_name: str, namespace: str) -> bool:
+    def format_pod_events(events: List[Dict], pod_name: str) -> str:
+        """Format the events involving a pod as a kubectl-style table"""
+        lines = []
+        for event in events:
+            if event.get("involvedObject", {}).get("name") != pod_name:
+                continue
+            lines.append("{}\t{}\t{}\t{}".format(
+                event.get("lastTimestamp") or "<unknown>",
+                event.get("type", ""),
+                event.get("reason", ""),
+                event.get("message", "").strip()
+            ))
+        if not lines:
+            return "No events found."
+        return "\n".join(["LAST SEEN\tTYPE\tREASON\tMESSAGE"] + lines)
+    
+    @staticmethod
+    async def restart_pod(pod_name: str, namespace: str) -> bool:
         """Restart a pod by deleting it"""
         try:
-            result = subprocess.run(
-                ["kubectl", "delete", "pod", pod_name, "-n", namespace],
-                capture_output=True,
-                text=True,
-                check=True
+            await KubernetesTools._check_kubectl(
+                ["delete", "pod", pod_name, "-n", namespace]
             )
             print(f"   SUCCESS: Restarted pod {pod_name}")
             return True
@@ -125,39 +287,35 @@ class KubernetesTools:
             return False
     
     @staticmethod
-    def update_deployment_env(deployment_name: str, namespace: str, env_vars: Dict) -> bool:
+    async def _container_names(deployment_name: str, namespace: str) -> List[str]:
+        """Get the container names of a deployment's pod template"""
+        stdout = await KubernetesTools._check_kubectl(
+            ["get", "deployment", deployment_name, "-n", namespace,
+             "-o", "jsonpath={.spec.template.spec.containers[*].name}"]
+        )
+        return stdout.split()
+    
+    @staticmethod
+    async def _patch_containers(deployment_name: str, namespace: str, containers: List[Dict]):
+        """Strategic-merge patch containers (matched by name) into a deployment"""
+        patch = {"spec": {"template": {"spec": {"containers": containers}}}}
+        await KubernetesTools._check_kubectl(
+            ["patch", "deployment", deployment_name, "-n", namespace,
+             "--type=strategic", "-p", _json_dumps(patch).decode()]
+        )
+    
+    @staticmethod
+    async def update_deployment_env(deployment_name: str, namespace: str, env_vars: Dict,
+                                    container_names: Optional[List[str]] = None) -> bool:
         """Update deployment environment variables"""
         try:
-            result = subprocess.run(
-                ["kubectl", "get", "deployment", deployment_name, "-n", namespace, "-o", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            deployment = json.loads(result.stdout)
+            if not container_names:
+                container_names = await KubernetesTools._container_names(deployment_name, namespace)
             
-            containers = deployment["spec"]["template"]["spec"]["containers"]
-            for container in containers:
-                if "env" not in container:
-                    container["env"] = []
-                
-                for key, value in env_vars.items():
-                    found = False
-                    for env in container["env"]:
-                        if env["name"] == key:
-                            env["value"] = value
-                            found = True
-                            break
-                    if not found:
-                        container["env"].append({"name": key, "value": value})
-            
-            deployment_json = json.dumps(deployment)
-            result = subprocess.run(
-                ["kubectl", "apply", "-f", "-"],
-                input=deployment_json,
-                capture_output=True,
-                text=True,
-                check=True
+            env = [{"name": key, "value": value} for key, value in env_vars.items()]
+            await KubernetesTools._patch_containers(
+                deployment_name, namespace,
+                [{"name": name, "env": env} for name in container_names]
             )
             print(f"   SUCCESS: Updated deployment {deployment_name}")
             print(f"   Added environment variables: {', '.join(env_vars.keys())}")
@@ -168,43 +326,23 @@ class KubernetesTools:
             return False
     
     @staticmethod
-    def increase_memory(deployment_name: str, namespace: str, new_limit: str) -> bool:
+    async def increase_memory(deployment_name: str, namespace: str, new_limit: str,
+                              container_names: Optional[List[str]] = None) -> bool:
         """Increase memory limit for a deployment"""
         try:
-            result = subprocess.run(
-                ["kubectl", "get", "deployment", deployment_name, "-n", namespace, "-o", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            deployment = json.loads(result.stdout)
+            if not container_names:
+                container_names = await KubernetesTools._container_names(deployment_name, namespace)
             
-            containers = deployment["spec"]["template"]["spec"]["containers"]
-            for container in containers:
-                if "resources" not in container:
-                    container["resources"] = {"limits": {}, "requests": {}}
-                if "limits" not in container["resources"]:
-                    container["resources"]["limits"] = {}
-                
-                container["resources"]["limits"]["memory"] = new_limit
-                
-                if "requests" not in container["resources"]:
-                    container["resources"]["requests"] = {}
-                
-                import re
-                match = re.match(r'(\d+)(\w+)', new_limit)
-                if match:
-                    value, unit = match.groups()
-                    request_value = int(int(value) * 0.8)
-                    container["resources"]["requests"]["memory"] = f"{request_value}{unit}"
+            resources = {"limits": {"memory": new_limit}}
+            match = re.match(r'(\d+)(\w+)', new_limit)
+            if match:
+                value, unit = match.groups()
+                request_value = int(int(value) * 0.8)
+                resources["requests"] = {"memory": f"{request_value}{unit}"}
             
-            deployment_json = json.dumps(deployment)
-            result = subprocess.run(
-                ["kubectl", "apply", "-f", "-"],
-                input=deployment_json,
-                capture_output=True,
-                text=True,
-                check=True
+            await KubernetesTools._patch_containers(
+                deployment_name, namespace,
+                [{"name": name, "resources": resources} for name in container_names]
             )
             print(f"   SUCCESS: Increased memory for {deployment_name} to {new_limit}")
             return True
@@ -214,15 +352,12 @@ class KubernetesTools:
             return False
     
     @staticmethod
-    def fix_image_name(deployment_name: str, namespace: str, new_image: str) -> bool:
+    async def fix_image_name(deployment_name: str, namespace: str, new_image: str) -> bool:
         """Fix image name in deployment"""
         try:
-            result = subprocess.run(
-                ["kubectl", "set", "image", f"deployment/{deployment_name}", 
-                 f"*={new_image}", "-n", namespace],
-                capture_output=True,
-                text=True,
-                check=True
+            await KubernetesTools._check_kubectl(
+                ["set", "image", f"deployment/{deployment_name}",
+                 f"*={new_image}", "-n", namespace]
             )
             print(f"   SUCCESS: Updated image for {deployment_name} to {new_image}")
             return True
@@ -234,115 +369,195 @@ class KubernetesTools:
 class AgenticMonitor:
     """Autonomous Kubernetes monitoring and remediation agent"""
     
-    def __init__(self, namespace: str, interval: int = 30, auto_remediate: bool = True):
+    def __init__(self, namespace: str, interval: int = 30, auto_remediate: bool = True,
+                 quiet: bool = False):
         self.namespace = namespace
         self.interval = interval
         self.auto_remediate = auto_remediate
+        self.quiet = quiet
         self.tools = KubernetesTools()
         self.memory = Memory()
         self.planner = Planner(self.memory)
         self.running = True
+        # resourceVersion of each pod that was healthy at the last check
+        self._seen: Dict[str, str] = {}
         
-        print("\n" + "="*70)
+        print("\n" + _SEP)
         print("AGENTIC K8S MONITOR - INITIALIZATION")
-        print("="*70)
+        print(_SEP)
         print(f"Namespace:        {namespace}")
-        print(f"Check interval:   {interval} seconds")
+        print(f"Max interval:     {interval} seconds")
         print(f"Auto-remediate:   {'ENABLED' if auto_remediate else 'DISABLED'}")
         
         stats = self.memory.get_statistics()
         print(f"Memory attempts:  {stats['total_attempts']}")
         print(f"Patterns learned: {stats['patterns_learned']}")
-        print("="*70 + "\n")
+        print(_SEP + "\n")
     
     async def run(self):
         """Main monitoring loop"""
-        print("="*70)
+        print(_SEP)
         print("STARTING AUTONOMOUS MONITORING")
-        print("="*70)
+        print(_SEP)
         print("Press Ctrl+C to stop\n")
         
         iteration = 0
+        self._pods_changed = asyncio.Event()
+        watcher = asyncio.create_task(self._watch_pods())
         
         try:
             while self.running:
                 iteration += 1
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 
-                print("\n" + "="*70)
-                print(f"ITERATION #{iteration} - {timestamp}")
-                print("="*70)
-                
                 # OBSERVE
-                print("\n[OBSERVE] Checking pod status...")
                 issues = await self.observe()
                 
+                # In quiet mode, healthy iterations print nothing
+                verbose = bool(issues) or not self.quiet
+                if verbose:
+                    print("\n" + _SEP)
+                    print(f"ITERATION #{iteration} - {timestamp}")
+                    print(_SEP)
+                    print("\n[OBSERVE] Checking pod status...")
+                
                 if not issues:
-                    print("Result: No issues detected - all pods healthy")
+                    if verbose:
+                        print("Result: No issues detected - all pods healthy")
                 else:
                     print(f"Result: Found {len(issues)} issue(s)\n")
                     
-                    for idx, issue in enumerate(issues, 1):
-                        print("-" * 70)
-                        print(f"ISSUE #{idx} of {len(issues)}")
-                        print("-" * 70)
-                        print(f"Pod name:    {issue.pod_name}")
-                        print(f"Status:      {issue.status}")
-                        print(f"Reason:      {issue.reason}")
-                        if issue.message:
-                            print(f"Message:     {issue.message[:100]}")
-                        
-                        # PLAN
-                        print("\n[PLAN] Creating remediation plan...")
-                        context = await self.gather_context(issue)
-                        plan = self.planner.create_plan(issue, context)
-                        
-                        print(f"\nRemediation plan ({len(plan)} step(s)):")
-                        for i, step in enumerate(plan, 1):
-                            print(f"\n  Step {i}: {step['action'].upper()}")
-                            print(f"  Reasoning: {step['reasoning'][:200]}")
-                            if len(step['reasoning']) > 200:
-                                print(f"             ...")
-                        
-                        # ACT
-                        if self.auto_remediate:
-                            print("\n[ACT] Executing remediation plan...")
-                            success = await self.execute_plan(issue, plan)
-                            
-                            # LEARN
-                            print("\n[LEARN] Storing results in memory...")
-                            for step in plan:
-                                attempt = RemediationAttempt(
-                                    issue=issue,
-                                    action=step['action'],
-                                    action_details=step['details'],
-                                    success=success,
-                                    timestamp=datetime.now().isoformat(),
-                                    reasoning=step['reasoning']
-                                )
-                                self.memory.store_attempt(attempt)
-                            print(f"Stored: {step['action']} attempt (success={success})")
-                        else:
-                            print("\n[ACT] Skipped - auto-remediation is disabled")
+                    # One namespace-wide events call, plus logs/describe for
+                    # every issue, all fetched concurrently
+                    events, *contexts = await asyncio.gather(
+                        self.tools.get_events(self.namespace),
+                        *(self.gather_context(issue) for issue in issues)
+                    )
+                    for issue, context in zip(issues, contexts):
+                        context["events"] = self.tools.format_pod_events(events, issue.pod_name)
+                    
+                    for idx, (issue, context) in enumerate(zip(issues, contexts), 1):
+                        await self._handle_issue(idx, len(issues), issue, context)
                 
-                print("\n" + "="*70)
-                print(f"Waiting {self.interval} seconds until next check...")
-                print("="*70)
-                await asyncio.sleep(self.interval)
+                if verbose:
+                    print("\n" + _SEP)
+                    print(f"Waiting for pod changes (at most {self.interval} seconds)...")
+                    print(_SEP)
+                await self._wait_for_changes()
                 
         except KeyboardInterrupt:
-            print("\n\n" + "="*70)
+            print("\n\n" + _SEP)
             print("MONITORING STOPPED BY USER")
-            print("="*70)
+            print(_SEP)
             self.print_summary()
+        finally:
+            watcher.cancel()
+    
+    async def _watch_pods(self):
+        """Flag pod changes reported by a long-running kubectl watch"""
+        while self.running:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "kubectl", "get", "pods", "-n", self.namespace,
+                    "--watch-only", "-o", "name",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+            except OSError as e:
+                print(f"WARNING: Could not start pod watch - {e}")
+                print(f"         Falling back to polling every {self.interval} seconds")
+                return
+            
+            try:
+                async for _ in proc.stdout:
+                    self._pods_changed.set()
+            finally:
+                # Killed only when cancelled mid-watch, see get_pods
+                if not proc.stdout.at_eof():
+                    proc.kill()
+                await proc.wait()
+            
+            # Watch disconnected, rely on the polling timeout until it is back
+            await asyncio.sleep(self.interval)
+    
+    async def _wait_for_changes(self):
+        """Sleep until a pod changes or the polling interval elapses"""
+        try:
+            await asyncio.wait_for(self._pods_changed.wait(), self.interval)
+            await asyncio.sleep(WATCH_SETTLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._pods_changed.clear()
+    
+    async def _handle_issue(self, idx: int, total: int, issue: Issue, context: Dict):
+        """Plan, act and learn for a single issue"""
+        print("-" * 70)
+        print(f"ISSUE #{idx} of {total}")
+        print("-" * 70)
+        print(f"Pod name:    {issue.pod_name}")
+        print(f"Status:      {issue.status}")
+        print(f"Reason:      {issue.reason}")
+        if issue.message:
+            print(f"Message:     {issue.message[:100]}")
+        
+        # PLAN
+        print("\n[PLAN] Creating remediation plan...")
+        plan = self.planner.create_plan(issue, context)
+        
+        print(f"\nRemediation plan ({len(plan)} step(s)):")
+        for i, step in enumerate(plan, 1):
+            print(f"\n  Step {i}: {step['action'].upper()}")
+            print(f"  Reasoning: {step['reasoning'][:200]}")
+            if len(step['reasoning']) > 200:
+                print(f"             ...")
+        
+        # ACT
+        if self.auto_remediate:
+            print("\n[ACT] Executing remediation plan...")
+            success = await self.execute_plan(issue, plan)
+            
+            # LEARN
+            print("\n[LEARN] Storing results in memory...")
+            now = datetime.now().isoformat()
+            self.memory.store_attempts([
+                RemediationAttempt(
+                    issue=issue,
+                    action=step['action'],
+                    action_details=step['details'],
+                    success=success,
+                    timestamp=now,
+                    reasoning=step['reasoning']
+                )
+                for step in plan
+            ])
+            print(f"Stored: {plan[-1]['action']} attempt (success={success})")
+        else:
+            print("\n[ACT] Skipped - auto-remediation is disabled")
+    
+    @staticmethod
+    def _pod_age(pod: Dict) -> float:
+        """Seconds since the pod was created; unknown counts as old, so the pod is reported"""
+        created = pod["metadata"].get("creationTimestamp")
+        try:
+            created_at = datetime.strptime(created, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            return float("inf")
+        return (datetime.now(timezone.utc) - created_at).total_seconds()
     
     async def observe(self) -> List[Issue]:
         """Observe cluster state and detect issues"""
         issues = []
-        pods = self.tools.get_pods(self.namespace)
-        
-        for pod in pods:
+        seen = {}
+        now = datetime.now().isoformat()
+        async for pod in self.tools.get_pods(self.namespace):
             pod_name = pod["metadata"]["name"]
+            rv = pod["metadata"]["resourceVersion"]
+            # Unchanged since it was last found healthy, nothing to re-check
+            if rv and self._seen.get(pod_name) == rv:
+                seen[pod_name] = rv
+                continue
+            pod_issues = len(issues)
+            starting = False
             status = pod["status"]["phase"]
             
             container_statuses = pod["status"].get("containerStatuses", [])
@@ -352,6 +567,11 @@ class AgenticMonitor:
                     
                     if "waiting" in state:
                         reason = state["waiting"].get("reason", "Unknown")
+                        if (reason in TRANSIENT_WAITING_REASONS
+                                and self._pod_age(pod) < TRANSIENT_GRACE_SECONDS):
+                            # Re-checked next pass even if unchanged
+                            starting = True
+                            continue
                         message = state["waiting"].get("message", "")
                         
                         issue = Issue(
@@ -360,8 +580,9 @@ class AgenticMonitor:
                             status="Waiting",
                             reason=reason,
                             message=message,
-                            timestamp=datetime.now().isoformat(),
-                            container_name=container_status["name"]
+                            timestamp=now,
+                            container_name=container_status["name"],
+                            pod=pod
                         )
                         issues.append(issue)
                     
@@ -376,23 +597,48 @@ class AgenticMonitor:
                             status="Terminated",
                             reason=reason,
                             message=f"Exit code: {exit_code}. {message}",
-                            timestamp=datetime.now().isoformat(),
-                            container_name=container_status["name"]
+                            timestamp=now,
+                            container_name=container_status["name"],
+                            pod=pod
                         )
                         issues.append(issue)
+            
+            if len(issues) == pod_issues and not starting:
+                seen[pod_name] = rv
         
+        # Rebuilt every pass, so deleted pods drop out
+        self._seen = seen
         return issues
     
     async def gather_context(self, issue: Issue) -> Dict:
         """Gather context for an issue"""
-        context = {}
-        context["logs"] = self.tools.get_pod_logs(issue.pod_name, self.namespace)
-        context["pod_description"] = self.tools.get_pod_description(issue.pod_name, self.namespace)
-        context["events"] = self.tools.get_pod_events(issue.pod_name, self.namespace)
-        return context
+        if issue.pod is not None:
+            # The pod list from observe() already has image, env, resources
+            # and container states, so skip a kubectl describe
+            return {
+                "logs": await self._issue_logs(issue),
+                "pod_description": self.tools.format_pod_description(issue.pod)
+            }
+        
+        logs, description = await asyncio.gather(
+            self._issue_logs(issue),
+            self.tools.get_pod_description(issue.pod_name, self.namespace)
+        )
+        return {
+            "logs": logs,
+            "pod_description": description
+        }
+    
+    async def _issue_logs(self, issue: Issue) -> str:
+        """Get logs for an issue, skipping kubectl if the container never started"""
+        if issue.reason in NOT_STARTED_REASONS:
+            return ""
+        return await self.tools.get_pod_logs(issue.pod_name, self.namespace)
     
     async def execute_plan(self, issue: Issue, plan: List[Dict]) -> bool:
         """Execute remediation plan"""
+        own_deployment = deployment_of(issue.pod_name)
+        
         for i, step in enumerate(plan, 1):
             action = step["action"]
             details = step["details"]
@@ -400,25 +646,34 @@ class AgenticMonitor:
             print(f"\n  Executing step {i}/{len(plan)}: {action.upper()}")
             
             success = False
+            deployment_name = details.get("deployment_name") or own_deployment
+            if action != "restart_pod" and not deployment_name:
+                print(f"   ERROR: No deployment could be inferred for {issue.pod_name}, skipping '{action}'")
+                continue
+            # Patch only the failing container when it belongs to the target
+            container_names = None
+            if issue.container_name and deployment_name == own_deployment:
+                container_names = [issue.container_name]
             
             if action == "restart_pod":
-                success = self.tools.restart_pod(issue.pod_name, self.namespace)
+                success = await self.tools.restart_pod(issue.pod_name, self.namespace)
             
             elif action == "update_env":
-                deployment_name = details.get("deployment_name", issue.pod_name.rsplit('-', 2)[0])
                 env_vars = details.get("env_vars", {})
-                success = self.tools.update_deployment_env(deployment_name, self.namespace, env_vars)
+                success = await self.tools.update_deployment_env(
+                    deployment_name, self.namespace, env_vars, container_names
+                )
             
             elif action == "increase_memory":
-                deployment_name = details.get("deployment_name", issue.pod_name.rsplit('-', 2)[0])
                 new_limit = details.get("new_limit", "512Mi")
-                success = self.tools.increase_memory(deployment_name, self.namespace, new_limit)
+                success = await self.tools.increase_memory(
+                    deployment_name, self.namespace, new_limit, container_names
+                )
             
             elif action == "fix_image_name":
-                deployment_name = details.get("deployment_name", issue.pod_name.rsplit('-', 2)[0])
                 new_image = details.get("new_image")
                 if new_image:
-                    success = self.tools.fix_image_name(deployment_name, self.namespace, new_image)
+                    success = await self.tools.fix_image_name(deployment_name, self.namespace, new_image)
             
             else:
                 print(f"   ERROR: Unknown action '{action}'")
@@ -434,14 +689,14 @@ class AgenticMonitor:
     def print_summary(self):
         """Print session summary"""
         stats = self.memory.get_statistics()
-        print("\n" + "="*70)
+        print("\n" + _SEP)
         print("SESSION SUMMARY")
-        print("="*70)
+        print(_SEP)
         print(f"Total remediation attempts:  {stats['total_attempts']}")
         print(f"Successful attempts:         {stats['successful_attempts']}")
         print(f"Success rate:                {stats['success_rate']*100:.1f}%")
         print(f"Patterns learned:            {stats['patterns_learned']}")
-        print("="*70 + "\n")
+        print(_SEP + "\n")
 
 
 def main():
@@ -449,21 +704,23 @@ def main():
     parser.add_argument("--namespace", "-n", default="agentic-demo",
                        help="Kubernetes namespace to monitor")
     parser.add_argument("--interval", "-i", type=int, default=30,
-                       help="Monitoring interval in seconds")
+                       help="Maximum seconds between checks (pod changes trigger a check sooner)")
     parser.add_argument("--no-auto", action="store_true",
                        help="Disable auto-remediation (observe only)")
     parser.add_argument("--fresh", "-f", action="store_true",
-                       help="Start with fresh memory (delete agentic_memory.json)")
+                       help="Start with fresh memory (delete stored attempts and patterns)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                       help="Only print iterations that found issues")
     
     args = parser.parse_args()
     
     if not os.getenv("OPENAI_API_KEY"):
-        print("\n" + "="*70)
+        print("\n" + _SEP)
         print("ERROR: OPENAI_API_KEY NOT SET")
-        print("="*70)
+        print(_SEP)
         print("Please set your OpenAI API key:")
         print("  export OPENAI_API_KEY='your-key-here'")
-        print("="*70 + "\n")
+        print(_SEP + "\n")
         sys.exit(1)
     
     reset_memory_if_requested(args)
@@ -471,7 +728,8 @@ def main():
     monitor = AgenticMonitor(
         namespace=args.namespace,
         interval=args.interval,
-        auto_remediate=not args.no_auto
+        auto_remediate=not args.no_auto,
+        quiet=args.quiet
     )
     
     asyncio.run(monitor.run())
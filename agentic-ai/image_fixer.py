@@ -2,6 +2,7 @@
 Image name typo detection helper
 """
 
+import re
 from typing import Optional
 
 # Common image name typos
@@ -15,6 +16,21 @@ COMMON_TYPOS = {
     "rediss": "redis",
 }
 
+_IMAGE_RE = re.compile(r'Image:\s+(.+?)(?:\n|$)')
+# Single alternation over every known typo, so one scan finds any of them
+_TYPO_RE = re.compile('|'.join(map(re.escape, COMMON_TYPOS)))
+# A string sharing no character with these cannot contain any typo
+_TYPO_FIRST_CHARS = frozenset(typo[0] for typo in COMMON_TYPOS)
+
+
+def _find_typo(text_lc: str) -> Optional[str]:
+    """Return the first known typo in an already-lowercased string"""
+    if _TYPO_FIRST_CHARS.isdisjoint(text_lc):
+        return None
+    match = _TYPO_RE.search(text_lc)
+    return match.group(0) if match else None
+
+
 def detect_and_fix_typo(image_name: str) -> Optional[str]:
     """
     Detect common typos in image names and suggest corrections
@@ -27,26 +43,26 @@ def detect_and_fix_typo(image_name: str) -> Optional[str]:
         tag = "latest"
     
     # Check for typos in image name
-    for typo, correct in COMMON_TYPOS.items():
-        if typo in name.lower():
-            corrected_name = name.lower().replace(typo, correct)
-            return f"{corrected_name}:{tag}"
+    name_lc = name.lower()
+    typo = _find_typo(name_lc)
+    if typo:
+        corrected_name = name_lc.replace(typo, COMMON_TYPOS[typo])
+        return f"{corrected_name}:{tag}"
     
     # Check for typos in tag
-    for typo, correct in COMMON_TYPOS.items():
-        if typo in tag.lower():
-            corrected_tag = tag.lower().replace(typo, correct)
-            return f"{name}:{corrected_tag}"
+    tag_lc = tag.lower()
+    typo = _find_typo(tag_lc)
+    if typo:
+        corrected_tag = tag_lc.replace(typo, COMMON_TYPOS[typo])
+        return f"{name}:{corrected_tag}"
     
     return None
 
 
 def extract_image_from_description(description: str) -> Optional[str]:
     """Extract image name from pod description"""
-    import re
-    
     # Look for image name in description
-    match = re.search(r'Image:\s+(.+?)(?:\n|$)', description)
+    match = _IMAGE_RE.search(description)
     if match:
         return match.group(1).strip()
     
@@ -5,9 +5,35 @@ Stores past issues, remediation attempts, and success rates
 
 import json
 import os
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional
+from dataclasses import dataclass, field
+from utils import deployment_of
+
+try:
+    import orjson
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None).encode()
+
+    _json_loads = json.loads
+
+
+ATTEMPTS_FILE = "agentic_attempts.jsonl"
+PATTERNS_FILE = "agentic_patterns.json"
+LEGACY_MEMORY_FILE = "agentic_memory.json"
+
+# Attempts kept in memory; the log is rotated to <attempts_file>.1 once it
+# holds this many, so at most two generations stay on disk
+MAX_ATTEMPTS = 10_000
+# Successful actions kept per learned pattern (recall uses the latest)
+MAX_ACTIONS_PER_PATTERN = 20
 
 
 @dataclass
@@ -20,6 +46,8 @@ class Issue:
     message: str
     timestamp: str
     container_name: Optional[str] = None
+    # Pod object from the observing list call, not persisted
+    pod: Optional[Dict] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -34,58 +62,177 @@ class RemediationAttempt:
 
 
 class Memory:
-    """Persistent memory for learning from past remediations"""
+    """Persistent memory for learning from past remediations
     
-    def __init__(self, memory_file: str = "agentic_memory.json"):
-        self.memory_file = memory_file
-        self.memory = self._load_memory()
+    Attempts are appended to a JSONL log, one line per attempt, so storing
+    an attempt never rewrites earlier ones. Only the latest MAX_ATTEMPTS
+    are kept. Learned patterns live in a small sidecar JSON file that is
+    only rewritten when a pattern changes.
+    """
     
-    def _load_memory(self) -> Dict:
-        """Load memory from file"""
-        if os.path.exists(self.memory_file):
+    def __init__(self, attempts_file: str = ATTEMPTS_FILE,
+                 patterns_file: str = PATTERNS_FILE,
+                 legacy_file: str = LEGACY_MEMORY_FILE):
+        self.attempts_file = attempts_file
+        self.rotated_attempts_file = attempts_file + ".1"
+        self.patterns_file = patterns_file
+        self._migrate_legacy(legacy_file)
+        self.patterns = self._load_patterns()
+        
+        # Bounded window of recent attempts, with running counters and a
+        # per-pod index so statistics and history never rescan the log
+        self._attempts = deque()
+        self._total = 0
+        self._success = 0
+        self._by_pod = defaultdict(deque)
+        # Latest successful action per deployment and issue type
+        self._solutions = {}
+        for attempt_dict in self._iter_attempts(self.rotated_attempts_file):
+            self._index_attempt(attempt_dict)
+        self._log_lines = 0
+        for attempt_dict in self._iter_attempts(self.attempts_file):
+            self._index_attempt(attempt_dict)
+            self._log_lines += 1
+        
+        self._attempts_log = open(self.attempts_file, 'ab', buffering=0)
+    
+    def _migrate_legacy(self, legacy_file: str):
+        """Convert an agentic_memory.json from older versions, once"""
+        if not os.path.exists(legacy_file) or os.path.exists(self.attempts_file):
+            return
+        try:
+            with open(legacy_file, 'rb') as f:
+                legacy = _json_loads(f.read())
+        except json.JSONDecodeError:
+            print(f"WARNING: Could not parse {legacy_file}, starting fresh")
+            return
+        
+        with open(self.attempts_file, 'wb') as f:
+            for attempt_dict in legacy.get("attempts", []):
+                f.write(_json_dumps(attempt_dict) + b"\n")
+        self.patterns = legacy.get("patterns", {})
+        self._save_patterns()
+        os.replace(legacy_file, legacy_file + ".migrated")
+        print(f"Migrated {legacy_file} to {self.attempts_file} and {self.patterns_file}")
+    
+    def _load_patterns(self) -> Dict:
+        """Load learned patterns from file"""
+        if os.path.exists(self.patterns_file):
             try:
-                with open(self.memory_file, 'r') as f:
-                    return json.load(f)
+                with open(self.patterns_file, 'rb') as f:
+                    return _json_loads(f.read())
             except json.JSONDecodeError:
-                print(f"WARNING: Could not parse {self.memory_file}, starting fresh")
-                return {"attempts": [], "patterns": {}}
-        return {"attempts": [], "patterns": {}}
+                print(f"WARNING: Could not parse {self.patterns_file}, starting fresh")
+        return {}
+    
+    def _save_patterns(self):
+        """Save learned patterns to file"""
+        with open(self.patterns_file, 'wb') as f:
+            f.write(_json_dumps(self.patterns, indent=True))
     
-    def _save_memory(self):
-        """Save memory to file"""
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.memory, f, indent=2)
+    def _iter_attempts(self, path: str) -> Iterator[Dict]:
+        """Lazily read stored attempts from a log, oldest first"""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield _json_loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line from an interrupted run
+                    continue
+    
+    def _index_attempt(self, attempt_dict: Dict):
+        """Add one attempt to the window, evicting the oldest when full"""
+        if len(self._attempts) == MAX_ATTEMPTS:
+            oldest = self._attempts.popleft()
+            self._total -= 1
+            if oldest["success"]:
+                self._success -= 1
+            pod_name = oldest["issue"]["pod_name"]
+            self._by_pod[pod_name].popleft()
+            if not self._by_pod[pod_name]:
+                del self._by_pod[pod_name]
+        
+        self._attempts.append(attempt_dict)
+        self._total += 1
+        if attempt_dict["success"]:
+            self._success += 1
+        self._by_pod[attempt_dict["issue"]["pod_name"]].append(attempt_dict)
+        if attempt_dict["success"]:
+            issue = attempt_dict["issue"]
+            self._solutions[self._solution_key(issue["pod_name"], issue["status"], issue["reason"])] = {
+                "action": attempt_dict["action"],
+                "details": attempt_dict["action_details"],
+                "reasoning": attempt_dict["reasoning"]
+            }
+    
+    @staticmethod
+    def _solution_key(pod_name: str, status: str, reason: str) -> str:
+        return f"{deployment_of(pod_name) or pod_name}|{status}_{reason}"
+    
+    def _rotate_log(self):
+        """Start a new attempts log, keeping the full one as .1"""
+        self._attempts_log.close()
+        os.replace(self.attempts_file, self.rotated_attempts_file)
+        self._attempts_log = open(self.attempts_file, 'ab', buffering=0)
+        self._log_lines = 0
     
     def store_attempt(self, attempt: RemediationAttempt):
         """Store a remediation attempt"""
-        attempt_dict = {
-            "issue": asdict(attempt.issue),
-            "action": attempt.action,
-            "action_details": attempt.action_details,
-            "success": attempt.success,
-            "timestamp": attempt.timestamp,
-            "reasoning": attempt.reasoning
-        }
-        self.memory["attempts"].append(attempt_dict)
+        self.store_attempts([attempt])
+    
+    def store_attempts(self, attempts: List[RemediationAttempt]):
+        """Store several remediation attempts with a single log write"""
+        lines = []
+        patterns_changed = False
+        for attempt in attempts:
+            attempt_dict = {
+                "issue": {
+                    "pod_name": attempt.issue.pod_name,
+                    "namespace": attempt.issue.namespace,
+                    "status": attempt.issue.status,
+                    "reason": attempt.issue.reason,
+                    "message": attempt.issue.message,
+                    "timestamp": attempt.issue.timestamp,
+                    "container_name": attempt.issue.container_name
+                },
+                "action": attempt.action,
+                "action_details": attempt.action_details,
+                "success": attempt.success,
+                "timestamp": attempt.timestamp,
+                "reasoning": attempt.reasoning
+            }
+            lines.append(_json_dumps(attempt_dict) + b"\n")
+            self._index_attempt(attempt_dict)
+            
+            if attempt.success:
+                self._update_patterns(attempt)
+                patterns_changed = True
         
-        if attempt.success:
-            self._update_patterns(attempt)
+        if self._log_lines >= MAX_ATTEMPTS:
+            self._rotate_log()
+        self._attempts_log.write(b"".join(lines))
+        self._log_lines += len(lines)
         
-        self._save_memory()
+        if patterns_changed:
+            self._save_patterns()
     
     def _update_patterns(self, attempt: RemediationAttempt):
         """Learn patterns from successful remediations"""
         if attempt.success:
             pattern_key = f"{attempt.issue.status}_{attempt.issue.reason}"
             
-            if pattern_key not in self.memory["patterns"]:
-                self.memory["patterns"][pattern_key] = {
+            if pattern_key not in self.patterns:
+                self.patterns[pattern_key] = {
                     "successful_actions": [],
                     "success_count": 0,
                     "total_count": 0
                 }
             
-            pattern = self.memory["patterns"][pattern_key]
+            pattern = self.patterns[pattern_key]
             pattern["total_count"] += 1
             pattern["success_count"] += 1
             
@@ -95,42 +242,41 @@ class Memory:
                 "reasoning": attempt.reasoning
             }
             pattern["successful_actions"].append(action_entry)
+            del pattern["successful_actions"][:-MAX_ACTIONS_PER_PATTERN]
     
     def recall_similar(self, issue: Issue) -> Optional[Dict]:
         """Recall successful remediations for similar issues"""
         pattern_key = f"{issue.status}_{issue.reason}"
         
-        if pattern_key in self.memory["patterns"]:
-            pattern = self.memory["patterns"][pattern_key]
+        if pattern_key in self.patterns:
+            pattern = self.patterns[pattern_key]
             if pattern["success_count"] > 0:
                 # Return most recent successful action
                 return pattern["successful_actions"][-1]
         
         return None
     
+    def recall_exact(self, issue: Issue) -> Optional[Dict]:
+        """Recall the last successful remediation of this issue on the same deployment"""
+        return self._solutions.get(self._solution_key(issue.pod_name, issue.status, issue.reason))
+    
     def get_success_rate(self, pattern_key: str) -> float:
         """Get success rate for a pattern"""
-        if pattern_key in self.memory["patterns"]:
-            pattern = self.memory["patterns"][pattern_key]
+        if pattern_key in self.patterns:
+            pattern = self.patterns[pattern_key]
             if pattern["total_count"] > 0:
                 return pattern["success_count"] / pattern["total_count"]
         return 0.0
     
     def get_history(self, pod_name: str) -> List[Dict]:
         """Get remediation history for a specific pod"""
-        return [
-            attempt for attempt in self.memory["attempts"]
-            if attempt["issue"]["pod_name"] == pod_name
-        ]
+        return list(self._by_pod.get(pod_name, ()))
     
     def get_statistics(self) -> Dict:
         """Get memory statistics"""
-        total_attempts = len(self.memory["attempts"])
-        successful_attempts = sum(1 for a in self.memory["attempts"] if a["success"])
-        
         return {
-            "total_attempts": total_attempts,
-            "successful_attempts": successful_attempts,
-            "success_rate": successful_attempts / total_attempts if total_attempts > 0 else 0,
-            "patterns_learned": len(self.memory["patterns"])
+            "total_attempts": self._total,
+            "successful_attempts": self._success,
+            "success_rate": self._success / self._total if self._total > 0 else 0,
+            "patterns_learned": len(self.patterns)
         }
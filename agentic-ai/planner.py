@@ -3,22 +3,92 @@ Planner for Agentic AI
 Creates multi-step remediation plans using LLM reasoning
 """
 
+import hashlib
+import json
 import os
 import re
+import shelve
+import time
 import openai
 from typing import List, Dict, Optional
 from memory import Issue, Memory
+from utils import deployment_of
+from image_fixer import COMMON_TYPOS, _find_typo, extract_image_from_description
 
 
-IMAGE_TYPO_MAP = {
-    "apline": "alpine",
-    "latst": "latest",
-    "lastest": "latest",
-    "ubunut": "ubuntu",
-    "ngnix": "nginx",
-    "postgress": "postgres",
-    "rediss": "redis",
-}
+_ENV_RE = re.compile(r'([A-Z][A-Z_]+) is:\s*$', re.MULTILINE)
+_JSON_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Placeholder values for missing variables, by substring of the name
+_ENV_DEFAULTS = (("PASSWORD", "password123"), ("HOST", "localhost"), ("PORT", "3306"))
+_LOG_LEVELS = frozenset({"ERROR", "WARNING", "INFO", "DEBUG"})
+# Only the end of the logs is scanned; startup messages are recent
+ENV_SCAN_BYTES = 4096
+
+LLM_CACHE_FILE = "agentic_llm_cache"
+# Cached replies are reused for this long; older ones only when OpenAI is unreachable
+LLM_CACHE_TTL = 600
+
+
+def _has_json_array(text: str) -> bool:
+    """Whether text already contains a complete JSON array"""
+    start = text.find("[")
+    if start < 0:
+        return False
+    try:
+        json.loads(text[start:text.rfind("]") + 1])
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def cached_chat(client: openai.OpenAI, messages: List[Dict], model: str = "gpt-4",
+                temperature: float = 0.3, until_json_array: bool = False) -> str:
+    """Return the completion text, reusing a recent stored reply for an identical request"""
+    key = hashlib.sha256(json.dumps([model, temperature, messages]).encode()).hexdigest()
+    with shelve.open(LLM_CACHE_FILE) as cache:
+        entry = cache.get(key)
+    if not isinstance(entry, dict):
+        entry = None  # Nothing stored, or a reply from before replies were timestamped
+    if entry and time.time() - entry["time"] < LLM_CACHE_TTL:
+        return entry["content"]
+    
+    try:
+        content = _stream_chat(client, messages, model, temperature, until_json_array)
+    except openai.OpenAIError as e:
+        if not entry:
+            raise
+        print(f"WARNING: OpenAI request failed ({e}), using an expired cached reply")
+        return entry["content"]
+    
+    with shelve.open(LLM_CACHE_FILE) as cache:
+        cache[key] = {"content": content, "time": time.time()}
+    return content
+
+
+def _stream_chat(client: openai.OpenAI, messages: List[Dict], model: str,
+                 temperature: float, until_json_array: bool) -> str:
+    """Stream a completion and return its text
+    
+    With until_json_array the stream is closed as soon as a complete JSON
+    array has arrived, so trailing prose is not waited for.
+    """
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        stream=True
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content or ""
+        parts.append(text)
+        if until_json_array and "]" in text and _has_json_array("".join(parts)):
+            stream.response.close()
+            break
+    return "".join(parts)
 
 
 class Planner:
@@ -26,16 +96,21 @@ class Planner:
     
     def __init__(self, memory: Memory):
         self.memory = memory
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
+        # One client for the monitor's lifetime, so its connection is reused
+        self.client = openai.OpenAI(api_key=api_key)
     
     def create_plan(self, issue: Issue, context: Dict) -> List[Dict]:
         """Create a multi-step remediation plan"""
         
+        # The deployment-patching heuristics only apply to Deployment pods
+        deployment_name = deployment_of(issue.pod_name)
+        
         # Special handling for ImagePullBackOff
-        if issue.reason == "ImagePullBackOff" or issue.reason == "ErrImagePull":
-            typo_fix = self._detect_image_typo(context)
+        if deployment_name and issue.reason in ("ImagePullBackOff", "ErrImagePull"):
+            typo_fix = self._detect_image_typo(issue, context)
             if typo_fix:
                 print(f"Detection: Image typo found")
                 print(f"  Original: {typo_fix['original']}")
@@ -43,7 +118,7 @@ class Planner:
                 return [{
                     "action": "fix_image_name",
                     "details": {
-                        "deployment_name": issue.pod_name.rsplit('-', 2)[0],
+                        "deployment_name": deployment_name,
                         "new_image": typo_fix['corrected']
                     },
                     "reasoning": f"Detected typo in image name: '{typo_fix['original']}' should be '{typo_fix['corrected']}'",
@@ -51,7 +126,7 @@ class Planner:
                 }]
         
         # Special handling for CrashLoopBackOff
-        if issue.reason == "CrashLoopBackOff":
+        if deployment_name and issue.reason == "CrashLoopBackOff":
             missing_env = self._detect_missing_env_vars(context)
             if missing_env:
                 print(f"Detection: Missing environment variables")
@@ -60,15 +135,26 @@ class Planner:
                 return [{
                     "action": "update_env",
                     "details": {
-                        "deployment_name": issue.pod_name.rsplit('-', 2)[0],
+                        "deployment_name": deployment_name,
                         "env_vars": missing_env
                     },
                     "reasoning": f"Pod logs indicate missing environment variables: {', '.join(missing_env.keys())}",
                     "confidence": "high"
                 }]
         
-        # Check memory for learned solutions
-        similar_solution = self.memory.recall_similar(issue)
+        # Check memory for learned solutions, preferring one learned on this deployment
+        similar_solution = self.memory.recall_exact(issue)
+        if not similar_solution:
+            similar_solution = self.memory.recall_similar(issue)
+            # Learned on another deployment: retarget it at this pod's own,
+            # and drop deployment actions when the pod has none
+            if similar_solution and similar_solution["action"] != "restart_pod":
+                if deployment_name:
+                    similar_solution = dict(similar_solution, details=dict(
+                        similar_solution["details"], deployment_name=deployment_name
+                    ))
+                else:
+                    similar_solution = None
         
         if similar_solution:
             valid_actions = ["restart_pod", "update_env", "increase_memory", "fix_image_name"]
@@ -88,16 +174,10 @@ class Planner:
         prompt = self._build_planning_prompt(issue, context)
         
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-            
-            plan_text = response.choices[0].message.content
+            plan_text = cached_chat(self.client, [
+                {"role": "system", "content": self._get_system_prompt()},
+                {"role": "user", "content": prompt}
+            ], until_json_array=True)
             plan = self._parse_plan(plan_text, issue)
             
             return plan
@@ -111,46 +191,57 @@ class Planner:
                 "confidence": "low"
             }]
     
-    def _detect_image_typo(self, context: Dict) -> Optional[Dict]:
-        """Detect common typos in image names"""
-        pod_desc = context.get("pod_description", "")
+    def _get_image(self, issue: Issue, context: Dict) -> Optional[str]:
+        """Image of the failing container, read from the pod JSON when available"""
+        if issue.pod is not None:
+            for container in issue.pod["spec"]["containers"]:
+                if container["name"] == issue.container_name:
+                    return container["image"]
         
-        image_match = re.search(r'Image:\s+(.+?)(?:\n|$)', pod_desc)
-        if not image_match:
+        pod_desc = context.get("pod_description", "")
+        if "Image:" not in pod_desc:
+            return None
+        return extract_image_from_description(pod_desc)
+    
+    def _detect_image_typo(self, issue: Issue, context: Dict) -> Optional[Dict]:
+        """Detect common typos in image names"""
+        original_image = self._get_image(issue, context)
+        if not original_image:
             return None
         
-        original_image = image_match.group(1).strip()
+        image_lc = original_image.lower()
         
-        for typo, correct in IMAGE_TYPO_MAP.items():
-            if typo in original_image.lower():
-                corrected_image = original_image.lower().replace(typo, correct)
-                return {
-                    "original": original_image,
-                    "corrected": corrected_image
-                }
+        typo = _find_typo(image_lc)
+        if not typo:
+            return None
         
-        return None
+        return {
+            "original": original_image,
+            "corrected": image_lc.replace(typo, COMMON_TYPOS[typo])
+        }
     
     def _detect_missing_env_vars(self, context: Dict) -> Optional[Dict]:
         """Detect missing environment variables from logs"""
         logs = context.get("logs", "")
+        # Cheap substring check before running the regex
+        if " is:" not in logs:
+            return None
+        if len(logs) > ENV_SCAN_BYTES:
+            # Start at a line boundary so a cut-off name is not matched
+            logs = logs[-ENV_SCAN_BYTES:]
+            logs = logs[logs.find("\n") + 1:]
         env_vars = {}
         
         # Pattern: "VARIABLE_NAME is: " with empty value
-        matches = re.findall(r'([A-Z][A-Z_]+) is:\s*$', logs, re.MULTILINE)
-        for var_name in matches:
-            # Skip common log words
-            if var_name in ['ERROR', 'WARNING', 'INFO', 'DEBUG']:
+        for var_name in _ENV_RE.findall(logs):
+            # Skip common log words and names already seen
+            if var_name in _LOG_LEVELS or var_name in env_vars:
                 continue
-                
-            if "PASSWORD" in var_name:
-                env_vars[var_name] = "password123"
-            elif "HOST" in var_name:
-                env_vars[var_name] = "localhost"
-            elif "PORT" in var_name:
-                env_vars[var_name] = "3306"
-            else:
-                env_vars[var_name] = "default"
+            
+            env_vars[var_name] = next(
+                (value for key, value in _ENV_DEFAULTS if key in var_name),
+                "default"
+            )
         
         return env_vars if env_vars else None
     
@@ -205,7 +296,7 @@ Create a remediation plan. Only use: restart_pod, update_env, increase_memory, f
         """Format context information"""
         lines = []
         if "logs" in context:
-            lines.append(f"Recent Logs:\n{context['logs'][:800]}")
+            lines.append(f"Recent Logs:\n{context['logs'][-800:]}")
         if "pod_description" in context:
             lines.append(f"Pod Description:\n{context['pod_description'][:500]}")
         if "events" in context:
@@ -227,9 +318,7 @@ Create a remediation plan. Only use: restart_pod, update_env, increase_memory, f
     
     def _parse_plan(self, plan_text: str, issue: Issue) -> List[Dict]:
         """Parse LLM response into structured plan"""
-        import json
-        
-        json_match = re.search(r'\[.*\]', plan_text, re.DOTALL)
+        json_match = _JSON_RE.search(plan_text)
         if json_match:
             try:
                 plan = json.loads(json_match.group())
@@ -0,0 +1,23 @@
+"""
+Shared helpers for Agentic AI
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+# <replicaset-hash>-<id> suffix of a Deployment's pods, in Kubernetes' vowel-free alphabet
+_REPLICASET_SUFFIX_RE = re.compile(r'-[bcdfghjklmnpqrstvwxz2456789]{6,10}-[bcdfghjklmnpqrstvwxz2456789]{5}$')
+
+
+@lru_cache(maxsize=1024)
+def deployment_of(pod_name: str) -> Optional[str]:
+    """Infer the deployment name from a <deployment>-<replicaset-hash>-<id> pod name
+    
+    Returns None for pods not named that way (StatefulSet, bare or job
+    pods), so callers never patch a deployment that merely shares a prefix.
+    """
+    match = _REPLICASET_SUFFIX_RE.search(pod_name)
+    if not match or match.start() == 0:
+        return None
+    return pod_name[:match.start()]
@@ -1,9 +1,21 @@
 import os
+import re
+import time
 import json
+import shelve
+import hashlib
+import argparse
 import subprocess
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from openai import OpenAI, OpenAIError, BadRequestError
 from dotenv import load_dotenv
-from remediation import remediate_pod
+from remediation import propose_remediation, remediate_pods, deployment_of
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Load environment variables from .env
 load_dotenv()
@@ -11,17 +23,128 @@ load_dotenv()
 # Initialize OpenAI client
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def namespace_exists(namespace):
+# Model used for diagnoses; set OPENAI_MODEL to use another (e.g. gpt-4)
+MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Output cap per diagnosed pod; an RCA answer rarely needs more
+MAX_TOKENS_PER_POD = 800
+# Cap on a single pod's describe and logs in its prompt, to keep requests cheap
+POD_TOKENS = 4000
+
+# (context window, completion cap) in tokens, by model name prefix
+MODEL_LIMITS = {
+    "gpt-4o": (128000, 16384),
+    "gpt-4-turbo": (128000, 4096),
+    "gpt-4": (8192, 8192),
+    "gpt-3.5-turbo": (16385, 4096),
+}
+# Assumed for models not listed above
+DEFAULT_MODEL_LIMITS = (8192, 4096)
+# Chat format tokens added around the messages, plus some slack
+MESSAGE_OVERHEAD_TOKENS = 50
+
+def model_limits(model=MODEL):
+    """(context window, completion cap) of a model"""
+    for prefix in sorted(MODEL_LIMITS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_LIMITS[prefix]
+    return DEFAULT_MODEL_LIMITS
+
+LLM_CACHE_FILE = "llm_cache"
+
+# Cached GPT replies and diagnoses are reused for this long. Older ones are
+# only served when OpenAI cannot be reached.
+CACHE_TTL_SECONDS = 600
+
+def has_json_array(text):
+    """Whether text already contains a complete JSON array"""
+    start = text.find("[")
+    if start < 0:
+        return False
+    try:
+        json.loads(text[start:text.rfind("]") + 1])
+        return True
+    except ValueError:
+        return False
+
+def cached_chat(messages, model=MODEL, temperature=0.3, max_tokens=None,
+                until_json_array=False, on_text=None):
+    """Return the completion text, reusing a recent stored reply for an identical request.
+
+    on_text, if given, receives the reply as it arrives (all at once when cached).
+    """
+    key = hashlib.sha256(json.dumps([model, temperature, max_tokens, messages]).encode()).hexdigest()
+    with shelve.open(LLM_CACHE_FILE) as cache:
+        entry = cache.get(key)
+    if not isinstance(entry, dict):
+        entry = None  # Nothing stored, or a reply from before replies were timestamped
+    if entry and time.time() - entry["time"] < CACHE_TTL_SECONDS:
+        if on_text:
+            on_text(entry["content"])
+        return entry["content"]
+
+    try:
+        content = stream_chat(messages, model, temperature, max_tokens, until_json_array, on_text)
+    except OpenAIError as e:
+        if not entry:
+            raise
+        print(f"⚠️ OpenAI request failed ({e}), using an expired cached reply.")
+        if on_text:
+            on_text(entry["content"])
+        return entry["content"]
+
+    with shelve.open(LLM_CACHE_FILE) as cache:
+        cache[key] = {"content": content, "time": time.time()}
+    return content
+
+def stream_chat(messages, model, temperature, max_tokens=None, until_json_array=False, on_text=None):
+    """Stream a completion and return its text, passing each piece to on_text.
+
+    With until_json_array the stream is closed as soon as a complete JSON
+    array has arrived, so trailing prose is not waited for.
+    """
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content or ""
+        parts.append(text)
+        if on_text:
+            on_text(text)
+        if until_json_array and "]" in text and has_json_array("".join(parts)):
+            stream.response.close()
+            break
+    return "".join(parts)
+
+def list_namespaces():
+    """Names of all namespaces, or None if they cannot be listed"""
+    result = subprocess.run(
+        ["kubectl", "get", "ns", "-o", "jsonpath={.items[*].metadata.name}"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.split()
+
+def namespace_exists(namespace, all_namespaces=None):
+    if all_namespaces is not None:
+        return namespace in all_namespaces
+    # Listing may be forbidden while getting a single namespace is allowed
     result = subprocess.run(
         ["kubectl", "get", "namespace", namespace],
         capture_output=True, text=True
     )
     return result.returncode == 0
 
-def suggest_namespace(namespace):
-    result = subprocess.run(["kubectl", "get", "ns", "-o", "json"], capture_output=True, text=True)
-    ns_data = json.loads(result.stdout)
-    all_namespaces = [ns["metadata"]["name"] for ns in ns_data["items"]]
+def suggest_namespace(namespace, all_namespaces=None):
+    if all_namespaces is None:
+        all_namespaces = list_namespaces() or []
 
     from difflib import get_close_matches
     suggestions = get_close_matches(namespace, all_namespaces, n=3)
@@ -29,10 +152,20 @@ def suggest_namespace(namespace):
     if suggestions:
         print(f"🔍 Did you mean: {', '.join(suggestions)}?")
 
+# One line per pod: name, phase, then per container
+# "<waiting reason>|<restart count>|<ready>|<last exit code>", tab separated.
+# kubectl renders missing fields as empty strings.
+_POD_HEALTH_JSONPATH = (
+    '{range .items[*]}{.metadata.name}{"\\t"}{.status.phase}'
+    '{range .status.containerStatuses[*]}{"\\t"}{.state.waiting.reason}{"|"}{.restartCount}'
+    '{"|"}{.ready}{"|"}{.lastState.terminated.exitCode}{end}{"\\n"}{end}'
+)
+
 def get_unhealthy_pods(namespace):
     try:
+        # Ask kubectl for just the health fields instead of parsing full pod JSON
         result = subprocess.run(
-            ["kubectl", "get", "pods", "-n", namespace, "-o", "json"],
+            ["kubectl", "get", "pods", "-n", namespace, "-o", f"jsonpath={_POD_HEALTH_JSONPATH}"],
             capture_output=True, text=True, check=False
         )
 
@@ -41,13 +174,12 @@ def get_unhealthy_pods(namespace):
             print(f"🔍 kubectl says: {result.stderr.strip()}")
             return None  # Signal an error
 
-        data = json.loads(result.stdout)
         unhealthy_pods = []
 
-        for pod in data["items"]:
-            name = pod["metadata"]["name"]
-            status = pod["status"].get("phase", "")
-            container_statuses = pod["status"].get("containerStatuses", [])
+        for line in result.stdout.splitlines():
+            if not line:
+                continue
+            name, status, *container_statuses = line.split("\t")
 
             pod_unhealthy = False
 
@@ -56,25 +188,25 @@ def get_unhealthy_pods(namespace):
                 pod_unhealthy = True
 
             for cs in container_statuses:
+                waiting_reason, restart_count, ready, last_exit_code = cs.split("|")
+
                 # Check for waiting state with reason (e.g., CrashLoopBackOff, ImagePullBackOff, Unhealthy)
-                waiting_state = cs.get("state", {}).get("waiting")
-                if waiting_state and waiting_state.get("reason"):
+                if waiting_reason:
                     pod_unhealthy = True
                     break
                 
                 # Check if container restarted too often
-                if cs.get("restartCount", 0) > 3:
+                if int(restart_count or 0) > 3:
                     pod_unhealthy = True
                     break
 
                 # Check if readiness probe failed (container not ready)
-                if not cs.get("ready", True):
+                if ready == "false":
                     pod_unhealthy = True
                     break
 
                 # Check if last termination was due to non-zero exit code
-                last_terminated = cs.get("lastState", {}).get("terminated")
-                if last_terminated and last_terminated.get("exitCode", 0) != 0:
+                if last_exit_code and last_exit_code != "0":
                     pod_unhealthy = True
                     break
 
@@ -87,18 +219,70 @@ def get_unhealthy_pods(namespace):
         print(f"Unexpected error while checking pods: {e}")
         return None
 
-def get_pod_info(pod_name, namespace):
-    describe = subprocess.run(["kubectl", "describe", "pod", pod_name, "-n", namespace],
-                              capture_output=True, text=True)
-    logs = subprocess.run(["kubectl", "logs", pod_name, "-n", namespace],
-                          capture_output=True, text=True)
-
-    logs_output = logs.stdout if logs.returncode == 0 else "No logs available."
-    return describe.stdout, logs_output
-
-def analyze_with_gpt(pod_name, namespace, describe, logs):
-    print(f"\n🤖 Analyzing pod: {pod_name}...\n")
-    prompt = f"""You are a Kubernetes expert. Diagnose the following pod issue.
+def describe_pods(pod_names, namespace):
+    """Describe several pods with a single kubectl call, keyed by pod name"""
+    describe = subprocess.run(["kubectl", "describe", "pod", *pod_names, "-n", namespace],
+                              capture_output=True)
+
+    # Each pod's section starts with an unindented "Name:" line
+    descriptions = {}
+    for line in describe.stdout.decode("utf-8", errors="replace").splitlines(keepends=True):
+        if line.startswith("Name:"):
+            section = descriptions.setdefault(line.split(None, 1)[1].strip(), [])
+        if descriptions:
+            section.append(line)
+    return {name: "".join(lines) for name, lines in descriptions.items()}
+
+def get_pod_logs(pod_name, namespace, tail=200, since=None):
+    # Bounded by tail (and optionally since), as only the end reaches GPT
+    args = ["kubectl", "logs", pod_name, "-n", namespace, f"--tail={tail}"]
+    if since:
+        args.append(f"--since={since}")
+    # Raw bytes decoded once; stray non-UTF-8 bytes in logs become U+FFFD
+    logs = subprocess.run(args, capture_output=True)
+    return logs.stdout.decode("utf-8", errors="replace") if logs.returncode == 0 else "No logs available."
+
+# Pods whose logs are fetched at the same time
+KUBECTL_WORKERS = 8
+
+def get_pods_info(pod_names, namespace):
+    """(describe, logs) for several pods, in the same order.
+
+    All pods are described by one kubectl call while their logs are fetched
+    concurrently, since kubectl logs takes a single pod.
+    """
+    with ThreadPoolExecutor(max_workers=KUBECTL_WORKERS) as pool:
+        logs = pool.map(lambda pod: get_pod_logs(pod, namespace), pod_names)
+        descriptions = describe_pods(pod_names, namespace)
+        return [(descriptions.get(pod, ""), pod_logs) for pod, pod_logs in zip(pod_names, logs)]
+
+# describe lines worth sending to GPT
+_DESCRIBE_FIELDS = (
+    "Name:", "Namespace:", "Status:", "Image:", "State:", "Last State:", "Reason:",
+    "Message:", "Exit Code:", "Ready:", "Restart Count:", "Limits:", "Requests:",
+    "cpu:", "memory:", "Liveness:", "Readiness:", "Startup:"
+)
+# describe sections kept whole
+_DESCRIBE_SECTIONS = ("Conditions:", "Events:")
+
+def trim_describe(describe):
+    """Keep the status, resource and probe lines of kubectl describe, plus its conditions and events"""
+    kept = []
+    section = ""
+    for line in describe.splitlines():
+        if line[:1] not in ("", " "):
+            section = line
+        stripped = line.strip()
+        # Container headers ("  web:") keep multi-container output readable
+        is_container = (section.startswith(("Containers:", "Init Containers:"))
+                        and line[2:3] not in ("", " ") and stripped.endswith(":"))
+        if section.startswith(_DESCRIBE_SECTIONS) or is_container or stripped.startswith(_DESCRIBE_FIELDS):
+            kept.append(line)
+    return "\n".join(kept)
+
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a Kubernetes SRE expert."}
+
+POD_PROMPT = """You are a Kubernetes expert. Diagnose the following pod issue.
 
 Namespace: {namespace}
 Pod Name: {pod_name}
@@ -116,43 +300,340 @@ Please provide:
 4. Any supporting evidence from logs/events
 """
 
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a Kubernetes SRE expert."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.3
-    )
-    return response.choices[0].message.content.strip()
+BATCH_POD_BLOCK = """Pod {index}: {pod_name}
 
-def main():
-    namespace = input("Enter the namespace to scan: ").strip()
+--- kubectl describe pod ---
+{describe}
 
-    if not namespace_exists(namespace):
-        print(f"Error: Namespace '{namespace}' does not exist.")
-        suggest_namespace(namespace)  # Optional
-        return
+--- kubectl logs ---
+{logs}
+"""
 
-    unhealthy_pods = get_unhealthy_pods(namespace)
-    if unhealthy_pods is None:
-        return
+BATCH_PROMPT = """You are a Kubernetes expert. Diagnose each of the following pod issues.
 
-    if not unhealthy_pods:
-        print("All pods are healthy in this namespace.")
-        return
+Namespace: {namespace}
+
+{pods_text}
+For each pod, provide:
+1. Root cause
+2. Possible reasons
+3. Suggested fixes
+4. Any supporting evidence from logs/events
 
-    print(f"🔍 Found {len(unhealthy_pods)} unhealthy pod(s): {unhealthy_pods}")
+Return only a JSON array of {count} strings, where element i is the full diagnosis for Pod i+1.
+"""
 
-    for pod in unhealthy_pods:
-        describe, logs = get_pod_info(pod, namespace)
-        result = analyze_with_gpt(pod, namespace, describe, logs)
+# Rough characters per token when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+_encoding = None
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.encoding_for_model(MODEL)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+    return _encoding
+
+def count_tokens(text):
+    if tiktoken is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(_get_encoding().encode(text))
+
+def fit_tokens(text, max_tokens, keep_end=False):
+    """Cut text to max_tokens, keeping its start (or its end with keep_end)"""
+    if tiktoken is None:
+        limit = max_tokens * CHARS_PER_TOKEN
+        return text[-limit:] if keep_end else text[:limit]
+
+    tokens = _get_encoding().encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return _get_encoding().decode(tokens[-max_tokens:] if keep_end else tokens[:max_tokens])
+
+def completion_tokens(messages, wanted):
+    """wanted, clamped to the model's completion cap and to the context left after messages"""
+    context, completion = model_limits()
+    prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+    return max(1, min(wanted, completion, context - prompt_tokens - MESSAGE_OVERHEAD_TOKENS))
+
+# Earlier log lines worth keeping alongside the tail
+_LOG_ERROR_RE = re.compile(r'error|warn|panic|exception|traceback|fatal|oom|killed|permission denied|bind', re.I)
+# Share of a log budget reserved for them
+LOG_ERROR_SHARE = 0.3
+_LOG_GAP = "[...]"
+
+def condense_logs(logs, max_tokens):
+    """The end of the logs within max_tokens, led by error-looking lines from before it.
+
+    Runs of identical lines are collapsed first. Up to LOG_ERROR_SHARE of the
+    budget goes to the latest earlier error lines; without any, the tail gets it all.
+    """
+    lines = []
+    for line, repeats in groupby(logs.splitlines()):
+        count = len(list(repeats))
+        lines.append(line if count == 1 else f"{line}  [repeated {count}x]")
+    costs = [count_tokens(line) + 1 for line in lines]
+    max_tokens -= count_tokens(_LOG_GAP) + 1
+
+    def tail_start(budget):
+        start, used = len(lines), 0
+        while start and used + costs[start - 1] <= budget:
+            start -= 1
+            used += costs[start]
+        return start
+
+    error_budget = int(max_tokens * LOG_ERROR_SHARE)
+    start = tail_start(max_tokens - error_budget)
+    errors, used = [], 0
+    for i in range(start - 1, -1, -1):
+        if _LOG_ERROR_RE.search(lines[i]):
+            if used + costs[i] > error_budget:
+                break
+            errors.append(i)
+            used += costs[i]
+    if not errors:
+        start = tail_start(max_tokens)
+
+    kept = [lines[i] for i in reversed(errors)]
+    if start > len(errors):
+        kept.append(_LOG_GAP)
+    kept += lines[start:]
+    if start == len(lines) and lines:
+        # A single last line longer than the budget
+        kept.append(fit_tokens(lines[-1], max_tokens - used, keep_end=True))
+    return "\n".join(kept)
+
+def fit_pod(describe, logs, max_tokens, condense=True):
+    """Trimmed describe (at most half of max_tokens) and the end of the logs filling the rest"""
+    describe = fit_tokens(trim_describe(describe), max_tokens // 2)
+    log_budget = max_tokens - count_tokens(describe)
+    if condense:
+        return describe, condense_logs(logs, log_budget)
+    return describe, fit_tokens(logs, log_budget, keep_end=True)
+
+def print_streamed(text):
+    print(text, end="", flush=True)
+
+def analyze_with_gpt(pod_name, namespace, describe, logs, condense=True):
+    """Diagnose one pod, printing the diagnosis as it streams in.
+
+    Returns None if OpenAI rejects the request, so one pod cannot end the run.
+    """
+    print(f"\n🤖 Analyzing pod: {pod_name}...\n")
+    # Whatever the context leaves after the reply and the template, up to POD_TOKENS
+    context, completion = model_limits()
+    template = POD_PROMPT.format(namespace=namespace, pod_name=pod_name, describe="", logs="")
+    overhead = count_tokens(SYSTEM_MESSAGE["content"] + template) + MESSAGE_OVERHEAD_TOKENS
+    budget = min(POD_TOKENS, context - min(MAX_TOKENS_PER_POD, completion) - overhead)
+    describe, logs = fit_pod(describe, logs, budget, condense)
+    prompt = POD_PROMPT.format(namespace=namespace, pod_name=pod_name, describe=describe, logs=logs)
+
+    print(f"Diagnosis for pod {pod_name}:")
+    messages = [SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+    try:
+        diagnosis = cached_chat(messages, max_tokens=completion_tokens(messages, MAX_TOKENS_PER_POD),
+                                on_text=print_streamed)
+    except BadRequestError as e:
+        print(f"⚠️ Request for pod {pod_name} rejected ({e}).")
+        return None
+    print()
+    return diagnosis.strip()
+
+# Per-pod cap for the batched prompt, so many pods still fit in one request
+BATCH_POD_TOKENS = 650
+MAX_BATCH_PODS = 10
+
+def batch_size():
+    """Pods per batched request, so that their answers fit the completion cap and everything fits the context"""
+    context, completion = model_limits()
+    room = context - count_tokens(SYSTEM_MESSAGE["content"] + BATCH_PROMPT) - MESSAGE_OVERHEAD_TOKENS
+    block = count_tokens(BATCH_POD_BLOCK) + BATCH_POD_TOKENS
+    return max(1, min(MAX_BATCH_PODS, completion // MAX_TOKENS_PER_POD,
+                      room // (block + MAX_TOKENS_PER_POD)))
+
+def analyze_pods_with_gpt(namespace, pod_infos, condense=True):
+    """Diagnose several pods with a single request.
+
+    pod_infos is a list of (pod_name, describe, logs). Returns one diagnosis
+    per pod, in order, or None if the reply could not be parsed.
+    """
+    print(f"\n🤖 Analyzing {len(pod_infos)} pods in one request...\n")
+    blocks = []
+    for i, (pod_name, describe, logs) in enumerate(pod_infos, 1):
+        describe, logs = fit_pod(describe, logs, BATCH_POD_TOKENS, condense)
+        blocks.append(BATCH_POD_BLOCK.format(index=i, pod_name=pod_name, describe=describe, logs=logs))
+    prompt = BATCH_PROMPT.format(namespace=namespace, pods_text="\n".join(blocks), count=len(pod_infos))
+
+    messages = [SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+    content = cached_chat(messages, max_tokens=completion_tokens(messages, MAX_TOKENS_PER_POD * len(pod_infos)),
+                          until_json_array=True)
+    try:
+        diagnoses = json.loads(content[content.find("["):content.rfind("]") + 1])
+    except ValueError:
+        return None
+    if not isinstance(diagnoses, list) or len(diagnoses) != len(pod_infos):
+        return None
+    return [str(d).strip() for d in diagnoses]
+
+def diagnose_pods(namespace, pod_infos, condense=True):
+    """Diagnose (pod_name, describe, logs) entries, in batches of batch_size() pods.
+
+    Returns the diagnoses (None for a pod whose request was rejected) and,
+    for each, whether it was already printed while streaming.
+    """
+    results, printed = [], []
+    size = batch_size()
+    for start in range(0, len(pod_infos), size):
+        batch = pod_infos[start:start + size]
+        batch_results = None
+        if len(batch) > 1:
+            try:
+                batch_results = analyze_pods_with_gpt(namespace, batch, condense)
+            except BadRequestError as e:
+                print(f"⚠️ Batched request rejected ({e}), analyzing pods one by one.")
+            else:
+                if batch_results is None:
+                    print("⚠️ Could not parse batched diagnosis, analyzing pods one by one.")
+
+        if batch_results is not None:
+            results += batch_results
+            printed += [False] * len(batch)
+        else:
+            results += [analyze_with_gpt(pod, namespace, describe, logs, condense)
+                        for pod, describe, logs in batch]
+            printed += [True] * len(batch)
+    return results, printed
+
+DIAGNOSIS_CACHE_FILE = "diagnosis_cache.json"
+# Expired diagnoses are kept this long for the stale fallback, then dropped
+DIAGNOSIS_STALE_SECONDS = 24 * 60 * 60
+
+# describe lines that identify how a pod is failing
+_SYMPTOM_FIELDS = ("Image:", "State:", "Reason:", "Exit Code:", "Message:", "Warning")
+# Tokens with digits (restart counts, ages, hashes) that differ between replicas
+_VOLATILE_RE = re.compile(r'\w*\d\w*')
+
+def symptom_key(pod_name, describe, logs):
+    """Hash a pod's failure symptoms so replicas failing the same way share a key"""
+    deployment = deployment_of(pod_name) or pod_name
+    lines = [line.strip() for line in describe.splitlines()
+             if line.strip().startswith(_SYMPTOM_FIELDS)]
+    lines += logs.splitlines()[-20:]
+    text = "\n".join(lines).replace(pod_name, "<pod>")
+    text = _VOLATILE_RE.sub("#", text)
+    return hashlib.sha256(f"{deployment}\n{text}".encode()).hexdigest()
+
+def load_diagnosis_cache():
+    try:
+        with open(DIAGNOSIS_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_diagnosis_cache(cache):
+    cutoff = time.time() - DIAGNOSIS_STALE_SECONDS
+    cache = {key: entry for key, entry in cache.items() if entry.get("time", 0) >= cutoff}
+    with open(DIAGNOSIS_CACHE_FILE, "w") as f:
+        json.dump(cache, f, indent=2)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Diagnose unhealthy pods with GPT and propose remediations")
+    parser.add_argument("--namespace", "-n",
+                        help="Namespace to scan (prompted for when omitted)")
+    parser.add_argument("--pod", "-p", action="append", default=[],
+                        help="Pod to diagnose, repeatable or comma-separated (skips the health scan)")
+    parser.add_argument("--full-logs", action="store_true",
+                        help="Send the plain end of the logs, without collapsing repeats or keeping earlier errors")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    namespace = args.namespace or input("Enter the namespace to scan: ").strip()
+
+    all_namespaces = list_namespaces()
+    if not namespace_exists(namespace, all_namespaces):
+        print(f"Error: Namespace '{namespace}' does not exist.")
+        suggest_namespace(namespace, all_namespaces)  # Optional
+        return
 
-        print(f"\nDiagnosis for pod {pod}:\n{result}")
+    # Pods named on the command line are diagnosed as given, healthy or not
+    requested = [pod for arg in args.pod for pod in arg.split(",") if pod]
+    if requested:
+        unhealthy_pods = list(dict.fromkeys(requested))
+        print(f"🔍 Diagnosing {len(unhealthy_pods)} pod(s): {unhealthy_pods}")
+    else:
+        unhealthy_pods = get_unhealthy_pods(namespace)
+        if unhealthy_pods is None:
+            return
+
+        if not unhealthy_pods:
+            print("All pods are healthy in this namespace.")
+            return
+
+        print(f"🔍 Found {len(unhealthy_pods)} unhealthy pod(s): {unhealthy_pods}")
+
+    pod_infos = [(pod, describe, logs) for pod, (describe, logs)
+                 in zip(unhealthy_pods, get_pods_info(unhealthy_pods, namespace))]
+
+    # kubectl describe skips pods that do not exist, e.g. a mistyped --pod
+    missing = [pod for pod, describe, _ in pod_infos if not describe]
+    if missing:
+        print(f"⚠️ Pod(s) not found in namespace '{namespace}', skipping: {missing}")
+        pod_infos = [info for info in pod_infos if info[1]]
+        unhealthy_pods = [pod for pod, _, _ in pod_infos]
+        if not unhealthy_pods:
+            return
+
+    # Pods with the same symptoms as an earlier diagnosis (from this run or a
+    # previous one) reuse it instead of asking GPT again
+    cache = load_diagnosis_cache()
+    keys = {pod: symptom_key(pod, describe, logs) for pod, describe, logs in pod_infos}
+    now = time.time()
+    pending = {}
+    for pod, describe, logs in pod_infos:
+        if now - cache.get(keys[pod], {}).get("time", 0) >= CACHE_TTL_SECONDS:
+            pending.setdefault(keys[pod], (pod, describe, logs))
+
+    streamed = set()
+    if pending:
+        try:
+            results, printed = diagnose_pods(namespace, list(pending.values()), condense=not args.full_logs)
+        except OpenAIError as e:
+            if not all(key in cache for key in pending):
+                raise
+            print(f"⚠️ OpenAI request failed ({e}), using expired cached diagnoses.")
+        else:
+            for key, (pod, _, _), result, was_printed in zip(pending, pending.values(), results, printed):
+                if result is None:
+                    continue  # An expired entry, if any, stands in for it below
+                cache[key] = {"pod": pod, "diagnosis": result, "time": now}
+                if was_printed:
+                    streamed.add(pod)
+            save_diagnosis_cache(cache)
+
+    proposals = []
+    for pod in unhealthy_pods:
+        cached = cache.get(keys[pod])
+        if cached is None:
+            print(f"\n⚠️ No diagnosis for pod {pod}, skipping remediation.")
+            print("=" * 80)
+            continue
+        if cached["pod"] != pod:
+            print(f"♻️ Reusing diagnosis of {cached['pod']} for {pod} (same symptoms)")
+        result = cached["diagnosis"]
+
+        if pod in streamed:
+            print(f"\nPod {pod} (diagnosis above):")
+        else:
+            print(f"\nDiagnosis for pod {pod}:\n{result}")
         print("=" * 80)
         # 🔧 Dry-run remediation
-        from remediation import remediate_pod
-        remediate_pod(pod, namespace, result, dry_run=True)
+        proposals.append(propose_remediation(pod, namespace, result))
+
+    # One confirmation for all pods, then the chosen fixes run together
+    remediate_pods(proposals)
 
 if __name__ == "__main__":
     main()
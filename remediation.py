@@ -1,42 +1,76 @@
+import re
+import json
+import shlex
+import logging
 import subprocess
-import datetime
-import traceback
-
-def remediate_pod(pod_name, namespace, diagnosis, dry_run=True):
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Remediation commands and their outcomes, appended to remediation.log
+logger = logging.getLogger("remediation")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_handler = logging.FileHandler("remediation.log", delay=True)
+_log_handler.setFormatter(logging.Formatter("%(asctime)s | %(message)s"))
+logger.addHandler(_log_handler)
+
+# <replicaset-hash>-<random> suffix of a Deployment's pods, in Kubernetes' vowel-free alphabet
+_REPLICASET_SUFFIX_RE = re.compile(r"-[bcdfghjklmnpqrstvwxz2456789]{6,10}-[bcdfghjklmnpqrstvwxz2456789]{5}$")
+
+@lru_cache(maxsize=1024)
+def deployment_of(pod_name):
+    """Deployment of a <deployment-name>-<replicaSet-hash>-<random> pod, or None if not named that way"""
+    match = _REPLICASET_SUFFIX_RE.search(pod_name)
+    if not match or match.start() == 0:
+        return None
+    return pod_name[:match.start()]
+
+def propose_remediation(pod_name, namespace, diagnosis):
+    """Work out the remediation for a diagnosed pod without applying it.
+
+    Returns a proposal dict, or None if no automatic remediation applies.
+    """
     actions = []
     remediation_type = None
 
-    def infer_deployment_name(pod_name):
-        # Assumes pod name is like: <deployment-name>-<replicaSet-hash>-<random>
-        return "-".join(pod_name.split("-")[:-2])
-    deployment_name = infer_deployment_name(pod_name)
-    if "OOMKilled" in diagnosis:
+    deployment_name = deployment_of(pod_name)
+    if "OOMKilled" in diagnosis and deployment_name is None:
+        print(f"🔧 Detected OOMKilled, but {pod_name} does not look like a Deployment pod.")
+        actions.append(f"# Raise the memory limit of the workload owning {pod_name} manually.")
+
+    elif "OOMKilled" in diagnosis:
         remediation_type = "memory_patch"
         print(f"🔧 Detected OOMKilled. Suggest increasing memory limits.")
 
         recommended_mem = "400Mi"
-        deployment_name = infer_deployment_name(pod_name)
 
-        patch_cmd = (
-            f"kubectl patch deployment {deployment_name} -n {namespace} --type='json' "
-            f"-p='[{{\"op\": \"replace\", \"path\": \"/spec/template/spec/containers/0/resources/limits/memory\", "
-            f"\"value\": \"{recommended_mem}\"}}]'"
-        )
+        patch = [{
+            "op": "replace",
+            "path": "/spec/template/spec/containers/0/resources/limits/memory",
+            "value": recommended_mem
+        }]
+        patch_cmd = [
+            "kubectl", "patch", "deployment", deployment_name, "-n", namespace,
+            "--type=json", "-p", json.dumps(patch)
+        ]
 
         print(f"Dry run: Would patch deployment memory limit to {recommended_mem}")
-        print(f"Patch command: {patch_cmd}")
+        print(f"Patch command: {shlex.join(patch_cmd)}")
         actions.append(patch_cmd)
-        verify_cmd = f"kubectl get deployment {deployment_name} -n {namespace} -o jsonpath='{{.spec.template.spec.containers[0].resources.limits.memory}}'"
-        res = subprocess.run(verify_cmd, shell=True, capture_output=True, text=True)
+        verify_cmd = [
+            "kubectl", "get", "deployment", deployment_name, "-n", namespace,
+            "-o", "jsonpath={.spec.template.spec.containers[0].resources.limits.memory}"
+        ]
+        res = subprocess.run(verify_cmd, capture_output=True, text=True)
         print(f"Verified memory limit: {res.stdout.strip()}")
 
     elif "CrashLoopBackOff" in diagnosis:
         print(f"🔧 Detected CrashLoopBackOff. Suggest restarting the pod.")
 
-        restart_cmd = f"kubectl delete pod {pod_name} -n {namespace}"
+        restart_cmd = ["kubectl", "delete", "pod", pod_name, "-n", namespace]
         remediation_type = "restart_pod"
         print(f"Dry run: Would restart pod {pod_name}")
-        print(f"Restart command: {restart_cmd}")
+        print(f"Restart command: {shlex.join(restart_cmd)}")
         actions.append(restart_cmd)
 
     elif "probe" in diagnosis.lower() or "Liveness probe failed" in diagnosis:
@@ -55,69 +89,129 @@ def remediate_pod(pod_name, namespace, diagnosis, dry_run=True):
 
     else:
         print("No automatic remediation available.")
+        return None
+
+    return {
+        "pod": pod_name,
+        "namespace": namespace,
+        "deployment": deployment_name,
+        "type": remediation_type,
+        "actions": actions
+    }
+
+
+def apply_remediation(proposal, verify=True):
+    """Run a proposal's commands, then wait for its deployment to become available"""
+    for cmd in proposal["actions"]:
+        if isinstance(cmd, str):
+            print(f"Skipping comment/reminder: {cmd}")
+            continue
+        run_and_log(cmd)
+
+    # Only verify deployment health if actual action was taken
+    if verify and proposal["deployment"] and proposal["type"] in ["memory_patch", "restart_pod"]:
+        deployment_name = proposal["deployment"]
+        print(f"🔍 Verifying deployment {deployment_name} health...")
+        wait_cmd = [
+            "kubectl", "wait", "--for=condition=Available", f"deployment/{deployment_name}",
+            "-n", proposal["namespace"], "--timeout=30s"
+        ]
+        wait_result = subprocess.run(wait_cmd, capture_output=True, text=True)
+
+        verification_msg = (
+            f"Deployment {deployment_name} is now healthy."
+            if wait_result.returncode == 0
+            else f"Deployment {deployment_name} is still not healthy.\n {wait_result.stderr.strip()}"
+        )
+        print(verification_msg)
+
+        # Log verification result (Change 3)
+        log_remediation_action(wait_cmd, wait_result)
+
+
+def remediate_pod(pod_name, namespace, diagnosis, dry_run=True):
+    proposal = propose_remediation(pod_name, namespace, diagnosis)
+    if proposal is None:
         return
 
-    # This part was missing — it prompts the user and applies remediation
     if dry_run:
         confirm = input("Do you want to apply the above remediation? (yes/no): ").strip().lower()
         if confirm == "yes":
-            for cmd in actions:
-                if cmd.startswith("#"):
-                    print(f"Skipping comment/reminder: {cmd}")
-                    continue
-                run_and_log(cmd)
-
-            # Only verify deployment health if actual action was taken
-            if remediation_type in ["memory_patch", "restart_pod"]:
-                print("🔍 Verifying deployment health...")
-                wait_cmd = (
-                    f"kubectl wait --for=condition=Available deployment/{deployment_name} "
-                    f"-n {namespace} --timeout=30s"
-                )
-                wait_result = subprocess.run(wait_cmd, shell=True, capture_output=True, text=True)
-
-                verification_msg = (
-                    f"Deployment {deployment_name} is now healthy."
-                    if wait_result.returncode == 0
-                    else f"Deployment {deployment_name} is still not healthy.\n {wait_result.stderr.strip()}"
-                )
-                print(verification_msg)
-
-        if remediation_type in ["memory_patch", "restart_pod"]:
-            # Log verification result (Change 3)
-            with open("remediation.log", "a") as log_file:
-                log_file.write(
-                    f"{datetime.datetime.now()} | {wait_cmd} | "
-                    f"ReturnCode: {wait_result.returncode} | "
-                    f"Output: {wait_result.stdout.strip()} | "
-                    f"Error: {wait_result.stderr.strip()}\n"
-                )
+            apply_remediation(proposal)
         else:
             print("Skipping remediation.")
     else:
-        for cmd in actions:
-            if not cmd.startswith("#"):
-                run_and_log(cmd)
+        apply_remediation(proposal, verify=False)
+
+
+# Remediations applied at the same time
+REMEDIATION_WORKERS = 8
+
+def _parse_selection(answer, count):
+    """Indexes chosen by an all/none/1,3,5 answer, or None if it is invalid"""
+    if answer in ("all", "yes"):
+        return list(range(count))
+    if answer in ("", "none", "no"):
+        return []
+    try:
+        numbers = [int(n) for n in answer.replace(" ", "").split(",")]
+    except ValueError:
+        return None
+    if not all(1 <= n <= count for n in numbers):
+        return None
+    return [n - 1 for n in numbers]
+
+
+def remediate_pods(proposals):
+    """Ask once which proposals to apply, then apply the chosen ones concurrently"""
+    runnable = [
+        proposal for proposal in proposals
+        if proposal and any(not isinstance(cmd, str) for cmd in proposal["actions"])
+    ]
+    if not runnable:
+        return
+
+    print("\nProposed remediations:")
+    for i, proposal in enumerate(runnable, 1):
+        commands = "; ".join(shlex.join(cmd) for cmd in proposal["actions"] if not isinstance(cmd, str))
+        print(f"  {i}. {proposal['pod']}: {commands}")
+
+    answer = input("Apply which? (all/none/1,3,5): ").strip().lower()
+    selection = _parse_selection(answer, len(runnable))
+    if selection is None:
+        print("Invalid selection, skipping remediation.")
+        return
+    if not selection:
+        print("Skipping remediation.")
+        return
+
+    # Replicas of one deployment propose the same patch; apply it once
+    unique = {}
+    for i in selection:
+        unique.setdefault(json.dumps(runnable[i]["actions"]), runnable[i])
+
+    with ThreadPoolExecutor(max_workers=REMEDIATION_WORKERS) as pool:
+        list(pool.map(apply_remediation, unique.values()))
+
+
+def log_remediation_action(cmd, res):
+    """Append one command and its outcome to remediation.log"""
+    logger.info(
+        "%s | ReturnCode: %d | Output: %s | Error: %s",
+        shlex.join(cmd), res.returncode, res.stdout.strip(), res.stderr.strip()
+    )
 
 
 def run_and_log(cmd):
     try:
-        print(f"🔧 Executing: {cmd}")
-        res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-
-        with open("remediation.log", "a") as log_file:
-            log_entry = (
-                f"{datetime.datetime.now()} | {cmd} | "
-                f"ReturnCode: {res.returncode} | "
-                f"Output: {res.stdout.strip()} | "
-                f"Error: {res.stderr.strip()}\n"
-            )
-            log_file.write(log_entry)
+        print(f"🔧 Executing: {shlex.join(cmd)}")
+        res = subprocess.run(cmd, capture_output=True, text=True)
+        log_remediation_action(cmd, res)
 
         if res.returncode != 0:
             print(f"Command failed with return code {res.returncode}")
             print(f"STDERR: {res.stderr.strip()}")
 
-    except Exception:
-        print("Exception occurred while executing remediation command:")
-        traceback.print_exc()
+    except Exception as e:
+        print(f"Exception occurred while executing remediation command: {e}")
+        logger.exception("%s | Exception", shlex.join(cmd))